@@ -1,34 +1,47 @@
-import os, sys, webbrowser, ctypes
+import os, re, sys, string, webbrowser, ctypes, functools, multiprocessing
+import concurrent.futures
 from PySide6 import QtCore, QtGui, QtWidgets
 from pypdf import PdfReader, PdfWriter
 from ctypes import wintypes
 
+try:
+    import pikepdf  # optional: qpdf-backed, much faster page extraction
+except ImportError:
+    pikepdf = None
+
 APP_TITLE = "PDF Splitter Pro"
 DEFAULT_OUT = r"D:\UserData\Downloads" if os.path.isdir(r"D:\UserData\Downloads") else os.path.join(os.path.expanduser("~"), "Downloads")
 
+# ---- DWM bindings, resolved once at import (None off-Windows or when missing) ----
+
+# DWMWINDOWATTRIBUTE.DWMWA_USE_IMMERSIVE_DARK_MODE
+# Windows 11 SDK uses 20 (older Win10 SDKs used 19)
+_DWMWA_USE_IMMERSIVE_DARK_MODE = 20
+_DwmSetWindowAttribute = _DwmGetColorizationColor = None
+if sys.platform == "win32":
+    try:
+        _dwmapi = ctypes.WinDLL("dwmapi")
+        _DwmSetWindowAttribute = _dwmapi.DwmSetWindowAttribute
+        _DwmSetWindowAttribute.argtypes = [wintypes.HWND, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD]
+        _DwmGetColorizationColor = _dwmapi.DwmGetColorizationColor
+        _DwmGetColorizationColor.argtypes = [ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_bool)]
+    except (OSError, AttributeError):
+        _DwmSetWindowAttribute = _DwmGetColorizationColor = None
+
 # ---- helpers for light-theme contrast and button CSS ----
 def set_dark_title_bar(window_handle: int):
     """
     Enable dark title bar for a given window on Windows 11 (and some Win10 builds).
     """
-    if sys.platform != "win32":
-        return  # Non‑Windows: do nothing
+    if _DwmSetWindowAttribute is None:
+        return  # Non‑Windows, or dwmapi unavailable: do nothing
 
     try:
-        # Load dwmapi.dll
-        dwmapi = ctypes.WinDLL("dwmapi")
-        
-        # DWMWINDOWATTRIBUTE.DWMWA_USE_IMMERSIVE_DARK_MODE
-        # Windows 11 SDK uses 20 (older Win10 SDKs used 19)
-        DWMWA_USE_IMMERSIVE_DARK_MODE = 20
-        
         value = wintypes.BOOL(True)  # True to enable dark mode
-        
-        # Call DwmSetWindowAttribute
         # params: hwnd, attribute id, pointer to value, size of value
-        dwmapi.DwmSetWindowAttribute(
+        _DwmSetWindowAttribute(
             wintypes.HWND(window_handle),
-            wintypes.UINT(DWMWA_USE_IMMERSIVE_DARK_MODE),
+            _DWMWA_USE_IMMERSIVE_DARK_MODE,
             ctypes.byref(value),
             ctypes.sizeof(value)
         )
@@ -36,15 +49,16 @@ def set_dark_title_bar(window_handle: int):
         # On unsupported systems (e.g., Win7 or early Win10), this may fail
         print(f"Failed to set dark title bar: {e}")
 
+# sRGB channel value -> linear intensity, precomputed so _luminance never calls pow()
+_SRGB_LUT = [v/255.0/12.92 if v/255.0 <= 0.04045 else ((v/255.0+0.055)/1.055)**2.4 for v in range(256)]
+
+@functools.lru_cache(maxsize=32)
 def _luminance(hexc):
     c = hexc.lstrip("#")
-    r = int(c[0:2],16)/255.0
-    g = int(c[2:4],16)/255.0
-    b = int(c[4:6],16)/255.0
-    def srgb(v):
-        return v/12.92 if v<=0.04045 else ((v+0.055)/1.055)**2.4
-    return 0.2126*srgb(r)+0.7152*srgb(g)+0.0722*srgb(b)
+    r = int(c[0:2],16); g = int(c[2:4],16); b = int(c[4:6],16)
+    return 0.2126*_SRGB_LUT[r]+0.7152*_SRGB_LUT[g]+0.0722*_SRGB_LUT[b]
 
+@functools.lru_cache(maxsize=32)
 def ensure_contrast_on_light(accent: str, bg: str="#ffffff"):
     try:
         la = _luminance(accent); lb = _luminance(bg)
@@ -57,17 +71,15 @@ def ensure_contrast_on_light(accent: str, bg: str="#ffffff"):
         return f"#{r:02x}{g:02x}{b:02x}"
     return accent
 
-def btn_css(accent):
-    return (
-        "QPushButton{background:%s; color:#ffffff; border:none; border-radius:12px; padding:10px 18px;}"
-        "QPushButton:hover{opacity:0.96;}"
-        "QPushButton:pressed{opacity:0.88;}"
-    ) % accent
-
+@functools.lru_cache(maxsize=32)
 def win_system_accent_hex(default="#2f6bff"):
+    # Cached for the process lifetime; a live WM_DWMCOLORIZATIONCOLORCHANGED
+    # hook could invalidate this, but the app reads the accent once at startup.
+    if _DwmGetColorizationColor is None:
+        return default
     try:
         color = ctypes.c_uint(); opaque = ctypes.c_bool()
-        ctypes.windll.dwmapi.DwmGetColorizationColor(ctypes.byref(color), ctypes.byref(opaque))
+        _DwmGetColorizationColor(ctypes.byref(color), ctypes.byref(opaque))
         argb = color.value; r = (argb >> 16) & 0xFF; g = (argb >> 8) & 0xFF; b = argb & 0xFF
         return "#{:02x}{:02x}{:02x}".format(r,g,b)
     except Exception:
@@ -75,6 +87,15 @@ def win_system_accent_hex(default="#2f6bff"):
 
 # ---------- parsing ----------
 
+_TOKEN_SPLIT = re.compile(r"[,\s;]+")
+_INT_RE = re.compile(r"-?\d+")
+_RANGE_RE = re.compile(r"(-?\d+)(?:\.\.|-)(-?\d+)")
+
+def _tokenize(s):
+    """Split a rules string into a token tuple in a single pass."""
+    s = s.strip()
+    return tuple(t for t in _TOKEN_SPLIT.split(s) if t) if s else ()
+
 def _to_int(s):
     try: return int(s)
     except Exception: return None
@@ -83,6 +104,7 @@ def _norm_neg(i, total):
     if i is None: return None
     return total + 1 + i if i < 0 else i
 
+@functools.lru_cache(maxsize=256)
 def parse_ranges(tokens, total):
     """
     Parse range expressions like:
@@ -93,27 +115,30 @@ def parse_ranges(tokens, total):
     """
     low = [t.lower().strip() for t in tokens if t.strip()]
     if len(low) == 1 and low[0] in ("odd", "even"):
-        return [(i, i) for i in range(1, total + 1) if (i % 2 == 1) == (low[0] == "odd")]
+        return [(i, i) for i in range(1 if low[0] == "odd" else 2, total + 1, 2)]
     ranges = []
     for t in low:
-        if ".." in t: a, b = t.split("..", 1)
-        elif "-" in t: a, b = t.split("-", 1)
-        else: a = b = t
-        a = a.strip(); b = b.strip()
-        if a.lstrip("-").isdigit() and b.lstrip("-").isdigit():
-            ia = _norm_neg(int(a), total); ib = _norm_neg(int(b), total)
-            ia, ib = sorted([ia, ib])
-            if ia < 1 or ib > total: raise ValueError(f"Range {t} is out of bounds 1..{total}")
-            ranges.append((ia, ib))
+        m = _RANGE_RE.fullmatch(t)
+        if m:
+            ia = _norm_neg(int(m.group(1)), total); ib = _norm_neg(int(m.group(2)), total)
+        elif _INT_RE.fullmatch(t):
+            ia = ib = _norm_neg(int(t), total)
         else:
             raise ValueError(f"Invalid range: {t}")
+        ia, ib = sorted([ia, ib])
+        if ia < 1 or ib > total: raise ValueError(f"Range {t} is out of bounds 1..{total}")
+        ranges.append((ia, ib))
+    if not ranges: return []
     ranges.sort()
     merged = []
-    for st, ed in ranges:
-        if not merged or st > merged[-1][1] + 1: merged.append([st, ed])
-        else: merged[-1][1] = max(merged[-1][1], ed)
-    return [(a, b) for a, b in merged]
-
+    cs, ce = ranges[0]
+    for st, ed in ranges[1:]:
+        if st > ce + 1: merged.append((cs, ce)); cs, ce = st, ed
+        elif ed > ce: ce = ed
+    merged.append((cs, ce))
+    return merged
+
+@functools.lru_cache(maxsize=256)
 def parse_cutpoints(tokens, total):
     """
     Parse a list of cutpoints (1-based) and return a sorted unique list.
@@ -134,19 +159,18 @@ def seg_from_cutpoints(cps, total):
     for p in cps: segs.append((prev, p)); prev = p + 1
     segs.append((prev, total)); return segs
 
-def parse_smart(s, total):
+@functools.lru_cache(maxsize=256)
+def parse_smart_tokens(toks, total):
     """
-    Smart parser:
+    Smart parser over pre-tokenized input (see _tokenize):
     - If two numbers are provided, treat them as two cutpoints and extract the between-range (exclusive).
     - If ranges like "a-b" or ".." or "odd/even" are present, parse as ranges.
     - Else treat input as a list of cutpoints.
     - Empty input -> full 1..total.
     """
-    s = s.strip()
-    if not s: return ("ranges", [(1, total)])
-    toks = [t for t in s.replace(",", " ").replace(";", " ").split() if t]
-    low = [t.lower() for t in toks]
-    if all(t.lstrip("-").isdigit() for t in low) and len(low) == 2:
+    if not toks: return ("ranges", [(1, total)])
+    low = tuple(t.lower() for t in toks)
+    if len(low) == 2 and all(_INT_RE.fullmatch(t) for t in low):
         a = _norm_neg(_to_int(low[0]), total); b = _norm_neg(_to_int(low[1]), total)
         a, b = sorted([a, b])
         if a == b: raise ValueError("The two cutpoints cannot be the same")
@@ -156,55 +180,158 @@ def parse_smart(s, total):
         return ("ranges", parse_ranges(low, total))
     return ("cutpoints", parse_cutpoints(low, total))
 
-def write_segments(pdf_path, segments, out_dir, naming, merge_single=False):
+def parse_smart(s, total):
+    """String-form convenience wrapper around parse_smart_tokens."""
+    return parse_smart_tokens(_tokenize(s), total)
+
+def write_segments(pdf_path, segments, out_dir, naming, merge_single=False, source=None):
     """
     Write segments to disk as separate PDFs, or a single merged PDF if merge_single=True.
+    Uses pikepdf when available (much faster on large files); falls back to pypdf.
+    `source` may be an already-opened pikepdf.Pdf or pypdf PdfReader for pdf_path,
+    so callers that needed the page count don't pay for a second parse.
     """
-    reader = PdfReader(pdf_path)
     base = os.path.splitext(os.path.basename(pdf_path))[0]
     saved = []
+    if pikepdf is not None:
+        src = source if isinstance(source, pikepdf.Pdf) else pikepdf.Pdf.open(pdf_path)
+        try:
+            if merge_single:
+                dst = pikepdf.Pdf.new()
+                for a, b in segments:
+                    dst.pages.extend(src.pages[a - 1:b])
+                outp = os.path.join(out_dir, naming.format(base=base, mode="merge", idx=1, start=segments[0][0], end=segments[-1][1]))
+                dst.save(outp, linearize=False)
+                saved.append(outp); return saved
+            for idx, (a, b) in enumerate(segments, 1):
+                dst = pikepdf.Pdf.new()
+                dst.pages.extend(src.pages[a - 1:b])
+                outp = os.path.join(out_dir, naming.format(base=base, mode="range", idx=idx, start=a, end=b))
+                dst.save(outp, linearize=False)
+                saved.append(outp)
+            return saved
+        finally:
+            if src is not source: src.close()
+    reader = source if isinstance(source, PdfReader) else PdfReader(pdf_path)
     if merge_single:
         writer = PdfWriter()
-        for a, b in segments:
-            for p in range(a - 1, b):
-                writer.add_page(reader.pages[p])
+        page_indices = [p for a, b in segments for p in range(a - 1, b)]
+        writer.append(reader, pages=page_indices)  # bulk copy, shares resources across pages
         outp = os.path.join(out_dir, naming.format(base=base, mode="merge", idx=1, start=segments[0][0], end=segments[-1][1]))
-        with open(outp, "wb") as f: writer.write(f)
+        with open(outp, "wb", buffering=1024*1024) as f: writer.write(f)
         saved.append(outp); return saved
+    pages = list(reader.pages)  # resolve the page tree once, not per lookup
     for idx, (a, b) in enumerate(segments, 1):
         writer = PdfWriter()
         for p in range(a - 1, b):
-            writer.add_page(reader.pages[p])
+            writer.add_page(pages[p])
         outp = os.path.join(out_dir, naming.format(base=base, mode="range", idx=idx, start=a, end=b))
-        with open(outp, "wb") as f: writer.write(f)
+        with open(outp, "wb", buffering=1024*1024) as f: writer.write(f)
         saved.append(outp)
     return saved
 
+def segments_for(mode, s, total):
+    """
+    Resolve the rules string for one mode and page count into (start, end) segments.
+    """
+    toks = _tokenize(s)
+    if mode == "smart":
+        kind, data = parse_smart_tokens(toks, total)
+    elif mode == "ranges":
+        kind, data = "ranges", (parse_ranges(toks, total) if toks else [(1, total)])
+    else:
+        kind, data = "cutpoints", (parse_cutpoints(toks, total) if toks else [])
+    return data if kind == "ranges" else seg_from_cutpoints(data, total)
+
+# ---------- background work ----------
+
+def _split_one(path, mode, rules, out_dir, naming, merge_single):
+    """Open, parse and write one file; top-level so it pickles into worker processes."""
+    source = None
+    try:
+        source = pikepdf.Pdf.open(path) if pikepdf is not None else PdfReader(path)
+        total = len(source.pages)
+        segs = segments_for(mode, rules, total)
+        return len(write_segments(path, segs, out_dir, naming, merge_single=merge_single, source=source))
+    finally:
+        if pikepdf is not None and source is not None: source.close()
+
+class SplitBatchJob(QtCore.QRunnable):
+    """
+    Splits a batch of PDFs off the GUI thread. The files are fanned out to a
+    process pool (sidestepping the GIL for the zlib-heavy PDF work); this
+    runnable just blocks on results and relays them as queued signals.
+    """
+    class Signals(QtCore.QObject):
+        done = QtCore.Signal(str, int)
+        failed = QtCore.Signal(str, str)
+
+    def __init__(self, paths, mode, rules, out_dir, naming, merge_single):
+        super().__init__()
+        self.paths = list(paths); self.mode = mode; self.rules = rules
+        self.out_dir = out_dir; self.naming = naming; self.merge_single = merge_single
+        self.signals = SplitBatchJob.Signals()
+
+    def _args(self, path):
+        return (path, self.mode, self.rules, self.out_dir, self.naming, self.merge_single)
+
+    def run(self):
+        try:
+            ex = concurrent.futures.ProcessPoolExecutor(max_workers=min(len(self.paths), os.cpu_count() or 1))
+        except Exception:
+            ex = None  # no subprocess support here; split on this thread instead
+        if ex is None:
+            for path in self.paths:
+                try: self.signals.done.emit(path, _split_one(*self._args(path)))
+                except Exception as e: self.signals.failed.emit(path, str(e))
+            return
+        with ex:
+            futs = {ex.submit(_split_one, *self._args(path)): path for path in self.paths}
+            for fut in concurrent.futures.as_completed(futs):
+                path = futs[fut]
+                try: self.signals.done.emit(path, fut.result())
+                except Exception as e: self.signals.failed.emit(path, str(e))
+
 # ---------- theming ----------
 
-def build_qss(dark: bool, accent: str) -> str:
-    BG = "#0f1115" if dark else "#f6f7f9"
-    TEXT = "#e8ecf2" if dark else "#1c1f26"
-    CTRL_BG = "#181c23" if dark else "#ffffff"
-    return f"""
-* {{ font-family: "Segoe UI", "Segoe UI Variable", "Arial"; }}
-QWidget {{ background: {BG}; color: {TEXT}; }}
-QLabel, QCheckBox, QRadioButton {{ background: transparent; }}
-QLineEdit, QComboBox {{
-  background: {CTRL_BG}; border: none; border-radius: 14px; padding: 12px 14px; color: {TEXT};
-}}
-QListWidget {{
-  background: {CTRL_BG}; border: none; border-radius: 16px; padding: 10px; color: {TEXT};
-}}
-QPushButton {{
-  background: {accent}; color: #ffffff; border: none; border-radius: 12px; padding: 10px 18px;
-}}
-QPushButton:disabled {{ background: rgba(127,127,127,0.35); }}
-QProgressBar {{ background: {'#1a2230' if dark else '#e7edf5'}; border-radius: 9px; height: 16px; }}
-QProgressBar::chunk {{ background: {accent}; border-radius: 9px; }}
-QScrollBar:vertical, QScrollBar:horizontal {{ width:0px; height:0px; background: transparent; }}
-Segmented, ToggleSwitch {{ background: transparent; }}
-"""
+_QSS_STATIC = (
+    '* { font-family: "Segoe UI", "Segoe UI Variable", "Arial"; }\n'
+    "QScrollBar:vertical, QScrollBar:horizontal { width:0px; height:0px; background: transparent; }\n"
+    "Segmented, ToggleSwitch { background: transparent; }\n"
+)
+
+_QSS_THEME = string.Template("""
+$W, $W QWidget { background: $BG; color: $TEXT; }
+$W QLabel, $W QCheckBox, $W QRadioButton { background: transparent; }
+$W QLineEdit, $W QComboBox {
+  background: $CTRL_BG; border: none; border-radius: 14px; padding: 12px 14px; color: $TEXT;
+}
+$W QListWidget {
+  background: $CTRL_BG; border: none; border-radius: 16px; padding: 10px; color: $TEXT;
+}
+$W QPushButton {
+  background: $AC; color: #ffffff; border: none; border-radius: 12px; padding: 10px 18px;
+}
+$W QPushButton:disabled { background: rgba(127,127,127,0.35); }
+$W QProgressBar { background: $TRACK; border-radius: 9px; height: 16px; }
+$W QProgressBar::chunk { background: $AC; border-radius: 9px; }
+""")
+
+@functools.lru_cache(maxsize=8)
+def build_qss(accent: str) -> str:
+    """
+    Build one application-wide sheet covering both themes, scoped by the main
+    window's dynamic "theme" property. Toggling the theme only flips that
+    property and re-polishes widgets instead of re-parsing stylesheets.
+    """
+    parts = [_QSS_STATIC]
+    for theme, bg, text, ctrl_bg, track, ac in (
+        ("dark", "#0f1115", "#e8ecf2", "#181c23", "#1a2230", accent),
+        ("light", "#f6f7f9", "#1c1f26", "#ffffff", "#e7edf5", ensure_contrast_on_light(accent)),
+    ):
+        parts.append(_QSS_THEME.substitute(
+            W=f'QMainWindow[theme="{theme}"]', BG=bg, TEXT=text, CTRL_BG=ctrl_bg, TRACK=track, AC=ac))
+    return "".join(parts)
 
 # ---------- widgets ----------
 
@@ -215,11 +342,11 @@ class Card(QtWidgets.QFrame):
         self.setAutoFillBackground(False)
         self.setAttribute(QtCore.Qt.WA_NoSystemBackground, True)
         self.radius = 18
+        self.shadow_margin = 12  # transparent border reserved for the baked shadow
         self.bg = QtGui.QColor("#ffffff")
-        self.shadow = QtWidgets.QGraphicsDropShadowEffect(self)
-        self.shadow.setBlurRadius(28); self.shadow.setOffset(0, 10); self.shadow.setColor(QtGui.QColor(0,0,0,36))
-        self.setGraphicsEffect(self.shadow)
-        self.v = QtWidgets.QVBoxLayout(self); self.v.setContentsMargins(20,18,20,18); self.v.setSpacing(12)
+        self._cache = None; self._cache_key = None  # rendered background, keyed on (size, bg, dpr)
+        s = self.shadow_margin
+        self.v = QtWidgets.QVBoxLayout(self); self.v.setContentsMargins(20+s,18+s,20+s,18+s); self.v.setSpacing(12)
         if title:
             lab = QtWidgets.QLabel(title); f = lab.font(); f.setPointSize(f.pointSize()+3); f.setWeight(QtGui.QFont.DemiBold); lab.setFont(f)
             self.v.addWidget(lab)
@@ -227,10 +354,26 @@ class Card(QtWidgets.QFrame):
     def setCardColor(self, c): self.bg = QtGui.QColor(c); self.update()
 
     def paintEvent(self, e):
-        p = QtGui.QPainter(self); p.setRenderHint(QtGui.QPainter.Antialiasing, True)
-        r = self.rect().adjusted(1,1,-1,-1)
-        path = QtGui.QPainterPath(); path.addRoundedRect(r, self.radius, self.radius)
-        p.fillPath(path, self.bg)
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), self.bg.rgba(), dpr)
+        if self._cache_key != key:
+            pm = QtGui.QPixmap(int(self.width()*dpr), int(self.height()*dpr))
+            pm.setDevicePixelRatio(dpr); pm.fill(QtCore.Qt.transparent)
+            pp = QtGui.QPainter(pm); pp.setRenderHint(QtGui.QPainter.Antialiasing, True); pp.setPen(QtCore.Qt.NoPen)
+            s = self.shadow_margin
+            r = QtCore.QRectF(self.rect().adjusted(s, s, -s, -s))
+            # Baked shadow: concentric rounded rects with decaying alpha, offset
+            # downward; rendered once into the cache, so it costs nothing per paint.
+            rings = s - 2
+            for i in range(rings, 0, -1):
+                a = int(8 * (1 - i / rings) ** 2) + 1
+                path = QtGui.QPainterPath()
+                path.addRoundedRect(r.adjusted(-i, -i + 3, i, i + 3), self.radius + i, self.radius + i)
+                pp.fillPath(path, QtGui.QColor(0, 0, 0, a))
+            path = QtGui.QPainterPath(); path.addRoundedRect(r, self.radius, self.radius)
+            pp.fillPath(path, self.bg); pp.end()
+            self._cache = pm; self._cache_key = key
+        QtGui.QPainter(self).drawPixmap(0, 0, self._cache)
 
 class ToggleSwitch(QtWidgets.QCheckBox):
     toggledVisual = QtCore.Signal(bool)
@@ -285,6 +428,8 @@ class Segmented(QtWidgets.QWidget):
         self.setAutoFillBackground(False)
         self.setStyleSheet("background: transparent;")
         self._items = items; self._idx = 0; self._accent = accent
+        self._fm = QtGui.QFontMetrics(self.font())
+        self._advances = [self._fm.horizontalAdvance(s) for s in items]
         self._rects = []
         self._pill = QtCore.QRect()
         self._pillPos = QtCore.QPoint(0,0)
@@ -303,13 +448,19 @@ class Segmented(QtWidgets.QWidget):
 
     def resizeEvent(self, e): self._layout_rects()
 
+    def changeEvent(self, e):
+        if e.type() == QtCore.QEvent.FontChange:
+            self._fm = QtGui.QFontMetrics(self.font())
+            self._advances = [self._fm.horizontalAdvance(s) for s in self._items]
+            self._layout_rects()
+        super().changeEvent(e)
+
     def _layout_rects(self):
-        fm = QtGui.QFontMetrics(self.font())
         pad_x = 18; h = 40; spacing = 6
         x = 6; y = (self.height()-h)//2
         rects = []
-        for s in self._items:
-            w = fm.horizontalAdvance(s) + pad_x*2
+        for adv in self._advances:
+            w = adv + pad_x*2
             rects.append(QtCore.QRect(x, y, w, h))
             x += w + spacing
         self._rects = rects
@@ -347,31 +498,49 @@ class Segmented(QtWidgets.QWidget):
 
 class DropList(QtWidgets.QListWidget):
     requestOpen = QtCore.Signal()
+    HINT_TEXT = "Drop PDFs here (or click to choose)"
     def __init__(self, accent="#2f6bff"):
         super().__init__(); self.setAcceptDrops(True)
         self._drag = 0.0; self._anim = QtCore.QVariantAnimation(self, startValue=0.0, endValue=1.0, duration=160); self._anim.valueChanged.connect(self._on_anim)
         self._accent = accent
+        self._fm = QtGui.QFontMetrics(self.font())
+        self._hint_w = self._fm.horizontalAdvance(self.HINT_TEXT)
+
+    def changeEvent(self, e):
+        if e.type() == QtCore.QEvent.FontChange:
+            self._fm = QtGui.QFontMetrics(self.font())
+            self._hint_w = self._fm.horizontalAdvance(self.HINT_TEXT)
+        super().changeEvent(e)
 
     def setAccent(self, c): self._accent = c; self.viewport().update()
 
-    def _on_anim(self, v): self._drag = v; self.viewport().update()
+    def _overlay_rect(self):
+        return self.viewport().rect().adjusted(16,16,-16,-16)
+
+    def _on_anim(self, v):
+        # Repaint just the overlay; a full list of PDFs shouldn't repaint at 60fps.
+        self._drag = v; self.viewport().update(self._overlay_rect())
 
     def dragEnterEvent(self, e):
         if e.mimeData().hasUrls():
-            e.acceptProposedAction(); self._anim.setDirection(QtCore.QAbstractAnimation.Forward); self._anim.start()
+            e.acceptProposedAction()
+            if self.count() == 0:
+                self._anim.setDirection(QtCore.QAbstractAnimation.Forward); self._anim.start()
 
     def dragLeaveEvent(self, e):
-        self._anim.setDirection(QtCore.QAbstractAnimation.Backward); self._anim.start()
+        if self.count() == 0:
+            self._anim.setDirection(QtCore.QAbstractAnimation.Backward); self._anim.start()
 
     def dropEvent(self, e):
-        self._anim.setDirection(QtCore.QAbstractAnimation.Backward); self._anim.start()
+        if self.count() == 0:
+            self._anim.setDirection(QtCore.QAbstractAnimation.Backward); self._anim.start()
         for url in e.mimeData().urls():
             p = url.toLocalFile()
             if p.lower().endswith(".pdf") and os.path.isfile(p): self.addItem(p)
 
     def mousePressEvent(self, ev):
         if ev.button() == QtCore.Qt.LeftButton:
-            inner = self.viewport().rect().adjusted(16,16,-16,-16)
+            inner = self._overlay_rect()
             if inner.contains(ev.position().toPoint() if hasattr(ev, "position") else ev.pos()):
                 self.requestOpen.emit(); ev.accept(); return
         super().mousePressEvent(ev)
@@ -380,7 +549,7 @@ class DropList(QtWidgets.QListWidget):
         super().paintEvent(ev)
         if self.count() > 0: return
         p = QtGui.QPainter(self.viewport()); p.setRenderHint(QtGui.QPainter.Antialiasing, True)
-        rect = self.viewport().rect().adjusted(16,16,-16,-16)
+        rect = self._overlay_rect()
         pen = QtGui.QPen(QtGui.QColor(0,0,0,40) if self.palette().color(QtGui.QPalette.Window).value()>128 else QtGui.QColor(255,255,255,38))
         pen.setStyle(QtCore.Qt.DashLine); pen.setWidth(2)
         p.setPen(pen); p.setBrush(QtCore.Qt.NoBrush); p.drawRoundedRect(rect, 16, 16)
@@ -397,13 +566,10 @@ class DropList(QtWidgets.QListWidget):
         p.drawLine(center.x(), center.y()-2, center.x()-7, center.y()-10)
         p.drawLine(center.x(), center.y()-2, center.x()+7, center.y()-10)
         p.restore()
-        text = "Drop PDFs here (or click to choose)"
-        fm = QtGui.QFontMetrics(self.font())
-        tw = fm.horizontalAdvance(text)
-        tx = center.x() - tw//2
-        ty = center.y() + 18 + fm.ascent()
+        tx = center.x() - self._hint_w//2
+        ty = center.y() + 18 + self._fm.ascent()
         p.setPen(self.palette().color(QtGui.QPalette.Mid))
-        p.drawText(QtCore.QPoint(tx, ty), text)
+        p.drawText(QtCore.QPoint(tx, ty), self.HINT_TEXT)
 
 class Toast(QtWidgets.QWidget):
     """Bottom-right stacked toasts, auto-dismiss, fade in/out, non-blocking."""
@@ -415,20 +581,42 @@ class Toast(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.v = QtWidgets.QVBoxLayout(self); self.v.setSpacing(10); self.v.setContentsMargins(12,12,12,12)
         self._items = []
+        self._total_h = 0          # running sum of item heights, avoids O(N) sizeHint walks
+        self._geo = None           # cached screen geometry, dropped on screenChanged
+        self._watching_screen = False
+        self._dirty = False
         self.hide()
         self._reposition()
 
+    def _invalidate_geo(self):
+        self._geo = None; self._schedule_reposition()
+
     def _screen_geo(self):
-        if self._parent is not None:
-            screen = self._parent.windowHandle().screen() if self._parent.windowHandle() else QtGui.QGuiApplication.primaryScreen()
-        else:
-            screen = QtGui.QGuiApplication.primaryScreen()
-        return screen.availableGeometry()
+        if self._geo is None:
+            handle = self._parent.windowHandle() if self._parent is not None else None
+            if handle is not None:
+                if not self._watching_screen:
+                    handle.screenChanged.connect(self._invalidate_geo); self._watching_screen = True
+                screen = handle.screen()
+            else:
+                screen = QtGui.QGuiApplication.primaryScreen()
+            self._geo = screen.availableGeometry()
+        return self._geo
+
+    def _schedule_reposition(self):
+        # Coalesce: a burst of pushes/pops repositions once on the next event-loop turn.
+        if self._dirty: return
+        self._dirty = True
+        QtCore.QTimer.singleShot(0, self._flush_reposition)
+
+    def _flush_reposition(self):
+        self._dirty = False
+        self._reposition()
 
     def _reposition(self):
         g = self._screen_geo()
         width = 360
-        height = sum(w.sizeHint().height()+10 for w in self._items) + 24
+        height = self._total_h + 24
         if height < 80: height = 80
         x = g.right() - self._margin - width
         y = g.bottom() - self._margin - height
@@ -441,7 +629,8 @@ class Toast(QtWidgets.QWidget):
         lab = QtWidgets.QLabel(text); lab.setWordWrap(True)
         l.addWidget(dot); l.addSpacing(8); l.addWidget(lab)
         self._items.append(w); self.v.addWidget(w, 0, QtCore.Qt.AlignRight)
-        self._reposition(); self.show()
+        w._toast_h = w.sizeHint().height() + 10; self._total_h += w._toast_h
+        self._schedule_reposition(); self.show()
         eff = QtWidgets.QGraphicsOpacityEffect(w); w.setGraphicsEffect(eff); eff.setOpacity(0.0)
         a1 = QtCore.QPropertyAnimation(eff, b"opacity"); a1.setStartValue(0.0); a1.setEndValue(1.0); a1.setDuration(180)
         a1.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
@@ -459,13 +648,13 @@ class Toast(QtWidgets.QWidget):
 
     def _remove_item(self, w):
         try:
-            self._items.remove(w)
+            self._items.remove(w); self._total_h -= getattr(w, "_toast_h", 0)
         except ValueError:
             pass
         w.setParent(None); w.deleteLater()
         if not self._items:
             self.hide()
-        self._reposition()
+        self._schedule_reposition()
 
 def resource_path(relative_path):
     """Get the absolute path to a resource. Works in dev and PyInstaller."""
@@ -492,7 +681,8 @@ class Main(QtWidgets.QMainWindow):
 
         self.dark = True
         self.accent = win_system_accent_hex("#2f6bff")
-        self.setStyleSheet(build_qss(self.dark, self.accent))
+        self.setProperty("theme", "dark")
+        self.setStyleSheet(build_qss(self.accent))
         # Grab window handle and set initial title bar color
         self.window_handle = self.winId()
         set_dark_title_bar(self.window_handle)
@@ -510,7 +700,7 @@ class Main(QtWidgets.QMainWindow):
         scroll.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         content = QtWidgets.QWidget(); scroll.setWidget(content)
-        grid = QtWidgets.QGridLayout(content); grid.setContentsMargins(16,16,16,16); grid.setHorizontalSpacing(12); grid.setVerticalSpacing(12)
+        grid = QtWidgets.QGridLayout(content); grid.setContentsMargins(6,6,6,6); grid.setHorizontalSpacing(0); grid.setVerticalSpacing(0)
 
         # Files / rules
         self.cardMain = Card("Files / Rules")
@@ -557,7 +747,7 @@ class Main(QtWidgets.QMainWindow):
 
         # Root layout
         central = QtWidgets.QWidget(); self.setCentralWidget(central)
-        root = QtWidgets.QVBoxLayout(central); root.setContentsMargins(16,16,16,16); root.setSpacing(12)
+        root = QtWidgets.QVBoxLayout(central); root.setContentsMargins(6,6,6,6); root.setSpacing(0)
         root.addWidget(self.topCard); root.addWidget(scroll, 1)
 
         # Toast
@@ -569,13 +759,14 @@ class Main(QtWidgets.QMainWindow):
         self.list.requestOpen.connect(self.addFiles)
 
         self._apply_card_bg()
-        self._style_buttons()
 
-    def _style_buttons(self):
-        accent = ensure_contrast_on_light(self.accent, "#ffffff" if not self.dark else "#0f1115")
-        css = btn_css(accent)
-        for b in (self.btnAdd, self.btnClear, self.browse, self.go, self.sample):
-            b.setStyleSheet(css)
+    def _repolish(self):
+        # One pass over the tree after flipping the "theme" property; the
+        # stylesheet itself is parsed once and never rebuilt.
+        st = self.style()
+        st.unpolish(self); st.polish(self)
+        for w in self.findChildren(QtWidgets.QWidget):
+            st.unpolish(w); st.polish(w)
 
     def _apply_card_bg(self):
         card_bg = "#14181e" if self.dark else "#ffffff"
@@ -584,11 +775,11 @@ class Main(QtWidgets.QMainWindow):
 
     def onThemeToggle(self, light_on: bool):
         self.dark = not light_on
-        self.setStyleSheet(build_qss(self.dark, self.accent))
+        self.setProperty("theme", "dark" if self.dark else "light")
+        self._repolish()
         self._apply_card_bg()
         for w in (self.themeToggle, self.merge, self.openFolder, self.openNotebook): w.setAccent(self.accent)
         self.seg.setAccent(self.accent); self.list.setAccent(self.accent)
-        self._style_buttons()
         if self.dark:
             set_dark_title_bar(self.window_handle)
         else:
@@ -617,29 +808,30 @@ class Main(QtWidgets.QMainWindow):
         if not out:
             self.toast.push("Output folder cannot be empty", self.accent); return
         os.makedirs(out, exist_ok=True)
-        s = self.rules.text().strip()
-        self.progress.setValue(0); step = 100 // max(1, self.list.count())
-        for i in range(self.list.count()):
-            path = self.list.item(i).text()
-            try:
-                total = len(PdfReader(path).pages)
-                mode = self.seg.currentText()
-                if mode=="smart":
-                    kind, data = parse_smart(s, total)
-                elif mode=="ranges":
-                    tokens = [t for t in s.replace(",", " ").replace(";", " ").split() if t]
-                    kind, data = "ranges", (parse_ranges(tokens, total) if tokens else [(1, total)])
-                else:
-                    tokens = [t for t in s.replace(",", " ").replace(";", " ").split() if t]
-                    kind, data = "cutpoints", (parse_cutpoints(tokens, total) if tokens else [])
-                segs = data if kind == "ranges" else seg_from_cutpoints(data, total)
-                outs = write_segments(path, segs, out, "{base}_part{idx:02d}_p{start}-{end}.pdf", merge_single=self.merge.isChecked())
-                self.toast.push(f"Done: {os.path.basename(path)} ({len(outs)} segments)", self.accent)
-            except Exception as e:
-                self.toast.push(f"Failed: {os.path.basename(path)} — {e}", self.accent)
-            self.progress.setValue(min(100, self.progress.value() + step)); QtWidgets.QApplication.processEvents()
-
-        if self.openFolder.isChecked(): QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(out))
+        s = self.rules.text().strip(); mode = self.seg.currentText()
+        self._pending = self.list.count(); self._out = out
+        self._step = 100 // max(1, self._pending)
+        self.progress.setValue(0); self.go.setEnabled(False)
+        paths = [self.list.item(i).text() for i in range(self.list.count())]
+        job = SplitBatchJob(paths, mode, s, out, "{base}_part{idx:02d}_p{start}-{end}.pdf", self.merge.isChecked())
+        job.signals.done.connect(self._job_done)
+        job.signals.failed.connect(self._job_failed)
+        QtCore.QThreadPool.globalInstance().start(job)
+
+    def _job_done(self, path, n):
+        self.toast.push(f"Done: {os.path.basename(path)} ({n} segments)", self.accent)
+        self._job_finished()
+
+    def _job_failed(self, path, msg):
+        self.toast.push(f"Failed: {os.path.basename(path)} — {msg}", self.accent)
+        self._job_finished()
+
+    def _job_finished(self):
+        self._pending -= 1
+        self.progress.setValue(min(100, self.progress.value() + self._step))
+        if self._pending > 0: return
+        self.progress.setValue(100); self.go.setEnabled(True)
+        if self.openFolder.isChecked(): QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(self._out))
         if self.openNotebook.isChecked():
             try: webbrowser.open("https://notebooklm.google.com/", new=2)
             except Exception: pass
@@ -651,4 +843,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # required for worker processes under PyInstaller
     main()